@@ -0,0 +1,101 @@
+"""Parameter models for HomeAssistantSkill actions."""
+
+from typing import Annotated, Any, Optional, TypeVar, Union
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+# A required string parameter; empty strings count as missing
+RequiredStr = Annotated[str, Field(min_length=1)]
+
+# A service target: one entity ID or a list of them, passed through to HA as given
+EntityTarget = Union[str, list[str]]
+
+# Validation error types reported as "Missing required parameter"
+_MISSING_ERRORS = frozenset({"missing", "string_too_short", "too_short"})
+
+
+class ActionParams(BaseModel):
+    """Base model for action parameters; unknown keys are ignored."""
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class GetStateParams(ActionParams):
+    entity_id: RequiredStr
+
+
+class GetStatesBatchParams(ActionParams):
+    entity_ids: Annotated[list[str], Field(min_length=1)]
+
+
+class CallServiceParams(ActionParams):
+    domain: RequiredStr
+    service: RequiredStr
+    entity_id: Optional[EntityTarget] = None
+    data: Optional[dict[str, Any]] = None
+
+
+class GetHistoryParams(ActionParams):
+    entity_id: RequiredStr
+    start: str = ""
+    end: Optional[str] = None
+    minimal_response: bool = False
+    no_attributes: bool = False
+    skip_initial_state: bool = False
+
+
+class GetConfigParams(ActionParams):
+    refresh: bool = False
+
+
+class GetEntitiesByDomainParams(ActionParams):
+    domain: RequiredStr
+
+
+class FireEventParams(ActionParams):
+    event_type: RequiredStr
+    event_data: Optional[dict[str, Any]] = None
+
+
+class GetLogbookParams(ActionParams):
+    entity: Optional[str] = None
+    start: str = ""
+    end: Optional[str] = None
+
+
+class RenderTemplateParams(ActionParams):
+    template: RequiredStr
+    no_cache: bool = False
+
+
+class GetAutomationsParams(ActionParams):
+    service: Optional[str] = None
+    entity_id: Optional[EntityTarget] = None
+
+
+class HealthCheckParams(ActionParams):
+    verify_api: bool = False
+
+
+P = TypeVar("P", bound=ActionParams)
+
+
+def parse_params(model: type[P], parameters: dict[str, Any]) -> P:
+    """Validate action parameters against ``model``.
+
+    An explicit ``None`` counts as "not given", so the field falls back to its
+    default (or is reported missing if required).
+
+    Raises:
+        ValueError: With the same "Missing required parameter: <name>" message
+            the handlers used before, or "Invalid parameter <name>: <reason>".
+    """
+    try:
+        return model.model_validate({k: v for k, v in parameters.items() if v is not None})
+    except ValidationError as e:
+        error = e.errors()[0]
+        # Report the top-level parameter; deeper loc parts are list indexes or union tags
+        name = str(error["loc"][0])
+        if error["type"] in _MISSING_ERRORS:
+            raise ValueError(f"Missing required parameter: {name}") from None
+        raise ValueError(f"Invalid parameter {name}: {error['msg']}") from None
@@ -1,10 +1,64 @@
 """Home Assistant Skill - Control your smart home via REST API."""
 
-from typing import Any, Optional
+import asyncio
+import time
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any, ClassVar, Optional
+from urllib.parse import quote, urlencode
 
 import httpx
+import orjson
+from openclaw_python_skill import SkillInput, SkillOutput
 from openclaw_python_skill.skill import Skill
 
+from .params import (
+    CallServiceParams,
+    FireEventParams,
+    GetAutomationsParams,
+    GetConfigParams,
+    GetEntitiesByDomainParams,
+    GetHistoryParams,
+    GetLogbookParams,
+    GetStateParams,
+    GetStatesBatchParams,
+    HealthCheckParams,
+    RenderTemplateParams,
+    parse_params,
+)
+
+_HISTORY_FLAGS = ("minimal_response", "no_attributes", "skip_initial_state")
+_AUTOMATION_SERVICES: frozenset[str] = frozenset({"trigger", "turn_on", "turn_off"})
+
+# Error messages for statuses that get a friendlier text than "HTTP <code>: <body>"
+_STATUS_MESSAGES: dict[int, str] = {
+    401: "Authentication failed: invalid or expired token",
+    404: "Not found: {path}",
+}
+
+
+def _state_result(s: dict[str, Any]) -> dict[str, Any]:
+    """Build an action result from a HA state entry.
+
+    ``attributes`` is shallow-copied: entries may come from the shared states cache,
+    and a caller editing its result must not change what later reads return.
+    """
+    return {
+        "entity_id": s.get("entity_id", ""),
+        "state": s.get("state", ""),
+        "attributes": dict(s.get("attributes") or {}),
+        "last_changed": s.get("last_changed", ""),
+    }
+
+
+def _history_result(entry: dict[str, Any]) -> dict[str, Any]:
+    """Build an action result from a HA history entry."""
+    return {
+        "state": entry.get("state", ""),
+        "last_changed": entry.get("last_changed", ""),
+        "attributes": dict(entry.get("attributes") or {}),
+    }
+
 
 class HomeAssistantSkill(Skill):
     """Interact with Home Assistant via its REST API.
@@ -12,6 +66,7 @@ class HomeAssistantSkill(Skill):
     Provides actions for:
     - get_states: List all entities and their current states
     - get_state: Get the state of a single entity
+    - get_states_batch: Get the states of several entities in one request
     - call_service: Call a Home Assistant service (e.g. turn on a light)
     - get_history: Get state history for an entity
     - get_config: Get Home Assistant configuration
@@ -22,247 +77,296 @@ class HomeAssistantSkill(Skill):
     - get_automations: List or control automations
     - device_summary: Human-readable summary of all devices
     - health_check: Check Home Assistant reachability
+
+    All API calls are async and share one ``httpx.AsyncClient``; use the skill as
+    an async context manager (or call ``aclose()``) to release its connections.
     """
 
-    def __init__(self, base_url: str, token: str, timeout: int = 10) -> None:
+    _AUTOMATION_PREFIX = "automation."
+    _TEMPLATE_CACHE_SIZE = 128
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        timeout: int = 10,
+        states_ttl: float = 2.0,
+        config_ttl: float = 60.0,
+        template_ttl: float = 1.0,
+        http2: bool = True,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
         super().__init__(name="homeassistant", version="1.0.0")
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.timeout = timeout
+        # Seconds a fetched /api/states payload is reused by state-reading actions
+        self.states_ttl = states_ttl
+        self._states_cache: Optional[tuple[float, list[dict[str, Any]]]] = None
+        # /api/config only changes when HA restarts, so it is kept much longer
+        self.config_ttl = config_ttl
+        self._config_cache: Optional[tuple[float, dict[str, Any]]] = None
+        # Rendered templates, least recently used first; the short TTL bounds staleness
+        # for templates that read live state
+        self.template_ttl = template_ttl
+        self._template_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Built once and sent with every request, so an injected client works unconfigured
+        self._api_url = f"{self.base_url}/api/"
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+        # One long-lived client so consecutive calls reuse pooled keep-alive connections;
+        # HTTP/2 (negotiated over TLS) multiplexes concurrent actions on one connection.
+        # An injected client is shared with the caller, who stays responsible for closing it.
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=http2,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10,
+                    max_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        self._client = client
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and release pooled connections.
+
+        Injected clients are left open for their owner to close.
+        """
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "HomeAssistantSkill":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def execute(self, input_data: SkillInput) -> SkillOutput:
+        """Run an action, awaiting the async action handlers."""
+        try:
+            result = await self.process(input_data.action, input_data.parameters)
+        except Exception as e:
+            return SkillOutput(success=False, error=str(e))
+        return SkillOutput(success=True, result=result)
+
+    @staticmethod
+    def _check_status(response: httpx.Response, path: str) -> None:
+        """Raise a ValueError for non-2xx/3xx responses."""
+        if response.status_code < 400:
+            return
+        message = _STATUS_MESSAGES.get(response.status_code)
+        if message is None:
+            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        raise ValueError(message.format(path=path))
 
-    def _request(
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        json: Optional[dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Send an authenticated request to an /api/ path and check its status."""
+        # Serialise bodies with orjson; the shared headers pin the JSON Content-Type
+        content = orjson.dumps(json) if json is not None else None
+        request = self._client.build_request(
+            method,
+            self._api_url + path.lstrip("/"),
+            content=content,
+            headers=self._headers,
+            timeout=self.timeout,
+        )
+        response = await self._client.send(request)
+        self._check_status(response, path)
+        return response
+
+    async def _request(
         self,
         method: str,
         path: str,
         json: Optional[dict[str, Any]] = None,
     ) -> Any:
         """Make an authenticated request to the Home Assistant API."""
-        url = f"{self.base_url}/api/{path.lstrip('/')}"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-
-        with httpx.Client(headers=headers, timeout=self.timeout) as client:
-            response = client.request(method, url, json=json)
-
-        if response.status_code == 401:
-            raise ValueError("Authentication failed: invalid or expired token")
-        if response.status_code == 404:
-            raise ValueError(f"Not found: {path}")
-        if response.status_code >= 400:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
-
-        return response.json()
+        response = await self._send(method, path, json)
+        return orjson.loads(response.content)
 
-    def _request_text(
+    async def _request_text(
         self,
         method: str,
         path: str,
         json: Optional[dict[str, Any]] = None,
     ) -> str:
         """Make an authenticated request that returns plain text."""
-        url = f"{self.base_url}/api/{path.lstrip('/')}"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-
-        with httpx.Client(headers=headers, timeout=self.timeout) as client:
-            response = client.request(method, url, json=json)
-
-        if response.status_code == 401:
-            raise ValueError("Authentication failed: invalid or expired token")
-        if response.status_code == 404:
-            raise ValueError(f"Not found: {path}")
-        if response.status_code >= 400:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
-
+        response = await self._send(method, path, json)
         return response.text
 
-    def process(self, action: str, parameters: dict[str, Any]) -> dict[str, Any]:
-        if action == "get_states":
-            return self._get_states()
-        elif action == "get_state":
-            return self._get_state(parameters)
-        elif action == "call_service":
-            return self._call_service(parameters)
-        elif action == "get_history":
-            return self._get_history(parameters)
-        elif action == "get_config":
-            return self._get_config()
-        elif action == "get_entities_by_domain":
-            return self._get_entities_by_domain(parameters)
-        elif action == "fire_event":
-            return self._fire_event(parameters)
-        elif action == "get_logbook":
-            return self._get_logbook(parameters)
-        elif action == "render_template":
-            return self._render_template(parameters)
-        elif action == "get_automations":
-            return self._get_automations(parameters)
-        elif action == "device_summary":
-            return self._device_summary()
-        elif action == "health_check":
-            return self._health_check()
-        else:
+    async def _get_states_cached(self) -> list[dict[str, Any]]:
+        """Fetch all states, reusing the last response while it is younger than states_ttl."""
+        cached = self._states_cache
+        if cached is not None and time.monotonic() - cached[0] < self.states_ttl:
+            return cached[1]
+
+        states: list[dict[str, Any]] = await self._request("GET", "states")
+        self._states_cache = (time.monotonic(), states)
+        return states
+
+    def invalidate_states(self) -> None:
+        """Drop the cached states so the next read refetches them."""
+        self._states_cache = None
+
+    def clear_caches(self) -> None:
+        """Drop all cached states, config and rendered templates."""
+        self.invalidate_states()
+        self._config_cache = None
+        self._template_cache.clear()
+
+    def _cached_config(self) -> Optional[dict[str, Any]]:
+        """Return the cached /api/config response if it is younger than config_ttl."""
+        cached = self._config_cache
+        if cached is not None and time.monotonic() - cached[0] < self.config_ttl:
+            return cached[1]
+        return None
+
+    async def _get_config_raw(self, refresh: bool = False) -> dict[str, Any]:
+        """Fetch /api/config, reusing the cached response unless refresh is set."""
+        config = None if refresh else self._cached_config()
+        if config is None:
+            config = await self._request("GET", "config")
+            self._config_cache = (time.monotonic(), config)
+        return config
+
+    async def process(self, action: str, parameters: dict[str, Any]) -> dict[str, Any]:
+        handler, needs_params = self._ACTIONS.get(action, (None, False))
+        if handler is None:
             raise ValueError(f"Unknown action: {action}")
+        if needs_params:
+            return await handler(self, parameters)
+        return await handler(self)
 
-    def _get_states(self) -> dict[str, Any]:
+    async def _get_states(self) -> dict[str, Any]:
         """List all entities and their states."""
-        states = self._request("GET", "states")
+        states = await self._get_states_cached()
         return {
-            "states": [
-                {
-                    "entity_id": s["entity_id"],
-                    "state": s["state"],
-                    "attributes": s.get("attributes", {}),
-                    "last_changed": s.get("last_changed", ""),
-                }
-                for s in states
-            ],
+            "states": [_state_result(s) for s in states],
             "count": len(states),
         }
 
-    def _get_state(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _get_state(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Get the state of a single entity."""
-        entity_id = parameters.get("entity_id")
-        if not entity_id:
-            raise ValueError("Missing required parameter: entity_id")
-
-        state = self._request("GET", f"states/{entity_id}")
+        p = parse_params(GetStateParams, parameters)
+        state = await self._request("GET", f"states/{p.entity_id}")
+        return _state_result(state)
+
+    async def _get_states_batch(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        """Get the states of several entities from a single /api/states fetch."""
+        entity_ids = parse_params(GetStatesBatchParams, parameters).entity_ids
+        states = await self._get_states_cached()
+        index = {s.get("entity_id"): s for s in states}
         return {
-            "entity_id": state["entity_id"],
-            "state": state["state"],
-            "attributes": state.get("attributes", {}),
-            "last_changed": state.get("last_changed", ""),
+            "states": [_state_result(index[e]) for e in entity_ids if e in index],
+            "missing": [e for e in entity_ids if e not in index],
         }
 
-    def _call_service(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _call_service(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Call a Home Assistant service."""
-        domain = parameters.get("domain")
-        if not domain:
-            raise ValueError("Missing required parameter: domain")
-        service = parameters.get("service")
-        if not service:
-            raise ValueError("Missing required parameter: service")
+        p = parse_params(CallServiceParams, parameters)
 
         body: dict[str, Any] = {}
-        entity_id = parameters.get("entity_id")
-        if entity_id:
-            body["entity_id"] = entity_id
+        if p.entity_id:
+            body["entity_id"] = p.entity_id
+        if p.data:
+            body.update(p.data)
 
-        data = parameters.get("data")
-        if data and isinstance(data, dict):
-            body.update(data)
-
-        result = self._request("POST", f"services/{domain}/{service}", json=body)
+        result = await self._request("POST", f"services/{p.domain}/{p.service}", json=body)
+        self.invalidate_states()
         return {
-            "domain": domain,
-            "service": service,
+            "domain": p.domain,
+            "service": p.service,
             "result": result if isinstance(result, list) else [],
         }
 
-    def _get_history(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _get_history(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Get state history for an entity."""
-        entity_id = parameters.get("entity_id")
-        if not entity_id:
-            raise ValueError("Missing required parameter: entity_id")
-
-        start = parameters.get("start", "")
-        path = f"history/period/{start}" if start else "history/period"
-        path += f"?filter_entity_id={entity_id}"
-
-        end = parameters.get("end")
-        if end:
-            path += f"&end_time={end}"
-
-        result = self._request("GET", path)
+        p = parse_params(GetHistoryParams, parameters)
+        path = f"history/period/{quote(p.start, safe=':')}" if p.start else "history/period"
+
+        query = {"filter_entity_id": p.entity_id}
+        if p.end:
+            query["end_time"] = p.end
+        # HA only checks these flags for presence; they shrink the payload considerably
+        for flag in _HISTORY_FLAGS:
+            if getattr(p, flag):
+                query[flag] = ""
+        path += f"?{urlencode(query, safe=':')}"
+
+        result = await self._request("GET", path)
         # HA returns a list of lists; first list is for the requested entity
-        history = result[0] if isinstance(result, list) and len(result) > 0 else []
+        history: list[dict[str, Any]] = next(iter(result), []) if isinstance(result, list) else []
 
         return {
-            "entity_id": entity_id,
-            "history": [
-                {
-                    "state": entry.get("state", ""),
-                    "last_changed": entry.get("last_changed", ""),
-                    "attributes": entry.get("attributes", {}),
-                }
-                for entry in history
-            ],
+            "entity_id": p.entity_id,
+            "history": [_history_result(entry) for entry in history],
             "count": len(history),
         }
 
-    def _get_config(self) -> dict[str, Any]:
+    async def _get_config(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Get Home Assistant configuration."""
-        config = self._request("GET", "config")
+        p = parse_params(GetConfigParams, parameters)
+        config = await self._get_config_raw(refresh=p.refresh)
+        # Copy the mutable members so callers can't edit the cached config
         return {
             "location_name": config.get("location_name", ""),
             "latitude": config.get("latitude"),
             "longitude": config.get("longitude"),
             "elevation": config.get("elevation"),
-            "unit_system": config.get("unit_system", {}),
+            "unit_system": dict(config.get("unit_system", {})),
             "time_zone": config.get("time_zone", ""),
             "version": config.get("version", ""),
-            "components": config.get("components", []),
+            "components": list(config.get("components", [])),
         }
 
-    def _get_entities_by_domain(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _get_entities_by_domain(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """List entities filtered by domain prefix."""
-        domain = parameters.get("domain")
-        if not domain:
-            raise ValueError("Missing required parameter: domain")
-
-        states = self._request("GET", "states")
+        domain = parse_params(GetEntitiesByDomainParams, parameters).domain
+        states = await self._get_states_cached()
         prefix = f"{domain}."
-        filtered = [s for s in states if s.get("entity_id", "").startswith(prefix)]
+        getter = dict.get
+        filtered = [s for s in states if getter(s, "entity_id", "").startswith(prefix)]
         return {
             "domain": domain,
-            "states": [
-                {
-                    "entity_id": s["entity_id"],
-                    "state": s["state"],
-                    "attributes": s.get("attributes", {}),
-                    "last_changed": s.get("last_changed", ""),
-                }
-                for s in filtered
-            ],
+            "states": [_state_result(s) for s in filtered],
             "count": len(filtered),
         }
 
-    def _fire_event(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _fire_event(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Fire an event on the Home Assistant event bus."""
-        event_type = parameters.get("event_type")
-        if not event_type:
-            raise ValueError("Missing required parameter: event_type")
-
-        event_data = parameters.get("event_data")
-        body = event_data if isinstance(event_data, dict) else None
-
-        result = self._request("POST", f"events/{event_type}", json=body)
+        p = parse_params(FireEventParams, parameters)
+        result = await self._request("POST", f"events/{p.event_type}", json=p.event_data)
+        self.invalidate_states()
         return {
-            "event_type": event_type,
+            "event_type": p.event_type,
             "message": result.get("message", ""),
         }
 
-    def _get_logbook(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _get_logbook(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Get logbook entries."""
-        start = parameters.get("start", "")
-        path = f"logbook/{start}" if start else "logbook"
+        p = parse_params(GetLogbookParams, parameters)
+        path = f"logbook/{quote(p.start, safe=':')}" if p.start else "logbook"
 
-        query_parts: list[str] = []
-        entity = parameters.get("entity")
-        if entity:
-            query_parts.append(f"entity={entity}")
-        end = parameters.get("end")
-        if end:
-            query_parts.append(f"end_time={end}")
+        query: dict[str, str] = {}
+        if p.entity:
+            query["entity"] = p.entity
+        if p.end:
+            query["end_time"] = p.end
 
-        if query_parts:
-            path += "?" + "&".join(query_parts)
+        if query:
+            path += f"?{urlencode(query, safe=':')}"
 
-        result = self._request("GET", path)
+        result = await self._request("GET", path)
         entries = result if isinstance(result, list) else []
         return {
             "entries": [
@@ -278,81 +382,81 @@ class HomeAssistantSkill(Skill):
             "count": len(entries),
         }
 
-    def _render_template(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _render_template(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Render a Jinja2 template using Home Assistant."""
-        template = parameters.get("template")
-        if not template:
-            raise ValueError("Missing required parameter: template")
-
-        result = self._request_text("POST", "template", json={"template": template})
+        p = parse_params(RenderTemplateParams, parameters)
+        template = p.template
+        cache = self._template_cache
+
+        cached = None if p.no_cache else cache.get(template)
+        if cached is not None and time.monotonic() - cached[0] < self.template_ttl:
+            cache.move_to_end(template)
+            return {"template": template, "result": cached[1]}
+
+        result = await self._request_text("POST", "template", json={"template": template})
+        # no_cache marks a volatile template: don't store it or evict anything for it
+        if not p.no_cache:
+            cache[template] = (time.monotonic(), result)
+            cache.move_to_end(template)
+            if len(cache) > self._TEMPLATE_CACHE_SIZE:
+                cache.popitem(last=False)
         return {
             "template": template,
             "result": result,
         }
 
-    def _get_automations(self, parameters: dict[str, Any]) -> dict[str, Any]:
+    async def _get_automations(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """List automations or control them (enable/disable/trigger)."""
-        service = parameters.get("service")
+        p = parse_params(GetAutomationsParams, parameters)
+        service, entity_id = p.service, p.entity_id
 
         if service:
-            entity_id = parameters.get("entity_id")
             if not entity_id:
                 raise ValueError("Missing required parameter: entity_id")
-            if service not in ("trigger", "turn_on", "turn_off"):
+            if service not in _AUTOMATION_SERVICES:
                 raise ValueError(
                     f"Invalid automation service: {service}. "
                     "Must be 'trigger', 'turn_on', or 'turn_off'"
                 )
-            result = self._request(
+            result = await self._request(
                 "POST",
                 f"services/automation/{service}",
                 json={"entity_id": entity_id},
             )
+            self.invalidate_states()
             return {
                 "entity_id": entity_id,
                 "service": service,
                 "result": result if isinstance(result, list) else [],
             }
 
-        states = self._request("GET", "states")
-        automations = [s for s in states if s.get("entity_id", "").startswith("automation.")]
+        states = await self._get_states_cached()
+        prefix = self._AUTOMATION_PREFIX
+        getter = dict.get
+        automations = [s for s in states if getter(s, "entity_id", "").startswith(prefix)]
         return {
-            "automations": [
-                {
-                    "entity_id": a["entity_id"],
-                    "state": a["state"],
-                    "attributes": a.get("attributes", {}),
-                    "last_changed": a.get("last_changed", ""),
-                }
-                for a in automations
-            ],
+            "automations": [_state_result(a) for a in automations],
             "count": len(automations),
         }
 
-    def _device_summary(self) -> dict[str, Any]:
+    async def _device_summary(self) -> dict[str, Any]:
         """Human-readable summary of all devices grouped by domain."""
-        states = self._request("GET", "states")
-        domains: dict[str, dict[str, int]] = {}
+        states = await self._get_states_cached()
+        domains: defaultdict[str, Counter[str]] = defaultdict(Counter)
         for s in states:
-            entity_id = s.get("entity_id", "")
-            if "." not in entity_id:
+            domain, sep, _ = s.get("entity_id", "").partition(".")
+            if not sep:
                 continue
-            domain = entity_id.split(".", 1)[0]
-            state = s.get("state", "unknown")
-            if domain not in domains:
-                domains[domain] = {}
-            domains[domain][state] = domains[domain].get(state, 0) + 1
-
-        summary: list[dict[str, Any]] = []
-        for domain, state_counts in sorted(domains.items()):
-            total = sum(state_counts.values())
-            summary.append(
-                {
-                    "domain": domain,
-                    "total": total,
-                    "states": state_counts,
-                }
-            )
+            domains[domain][s.get("state", "unknown")] += 1
+
+        summary = [
+            {
+                "domain": domain,
+                "total": sum(state_counts.values()),
+                "states": dict(state_counts),
+            }
+            for domain, state_counts in sorted(domains.items())
+        ]
 
         return {
             "summary": summary,
@@ -360,13 +464,44 @@ class HomeAssistantSkill(Skill):
             "total_domains": len(domains),
         }
 
-    def _health_check(self) -> dict[str, Any]:
-        """Check Home Assistant reachability and status."""
-        api_status = self._request("GET", "")
-        config = self._request("GET", "config")
+    async def _health_check(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        """Check Home Assistant reachability and status.
+
+        A fresh /api/config call already proves the API is up, so the cheap
+        /api/ status endpoint is only queried when ``verify_api`` is set or the
+        config comes from the cache and liveness still has to be confirmed.
+        """
+        p = parse_params(HealthCheckParams, parameters)
+        if p.verify_api or self._cached_config() is not None:
+            api_status, config = await asyncio.gather(
+                self._request("GET", ""),
+                self._get_config_raw(),
+            )
+            message = api_status.get("message", "")
+        else:
+            config = await self._get_config_raw()
+            message = "API running."
+
         return {
             "reachable": True,
-            "message": api_status.get("message", ""),
+            "message": message,
             "version": config.get("version", ""),
             "location_name": config.get("location_name", ""),
         }
+
+    # Action name -> (handler, whether the handler takes the action parameters)
+    _ACTIONS: ClassVar[dict[str, tuple[Callable[..., Awaitable[dict[str, Any]]], bool]]] = {
+        "get_states": (_get_states, False),
+        "get_state": (_get_state, True),
+        "get_states_batch": (_get_states_batch, True),
+        "call_service": (_call_service, True),
+        "get_history": (_get_history, True),
+        "get_config": (_get_config, True),
+        "get_entities_by_domain": (_get_entities_by_domain, True),
+        "fire_event": (_fire_event, True),
+        "get_logbook": (_get_logbook, True),
+        "render_template": (_render_template, True),
+        "get_automations": (_get_automations, True),
+        "device_summary": (_device_summary, False),
+        "health_check": (_health_check, True),
+    }
@@ -1,7 +1,74 @@
 """Shared test fixtures for openclaw-homeassistant."""
 
+import hashlib
+import os
 import sys
 from pathlib import Path
 
+import httpx
+import orjson
+import pytest
+import pytest_asyncio
+
 # Ensure the src directory is on the path for local development
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from openclaw_homeassistant import HomeAssistantSkill  # noqa: E402
+
+# Recorded GET responses for the live tests, one JSON file per request
+RESPONSE_CACHE_DIR = Path(__file__).resolve().parent / "fixtures" / "cache"
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_client():
+    """One httpx.AsyncClient (and connection pool) reused by every skill in a module.
+
+    Scoped to the module event loop the tests run on: a pool opened on one loop
+    can't be used from another once real connections are pooled.
+    """
+    async with httpx.AsyncClient() as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="module")
+async def live_skill():
+    """A skill talking to a real Home Assistant, enabled with HA_TEST_LIVE=1.
+
+    Reads HA_URL and HA_TOKEN from the environment.
+    """
+    if os.environ.get("HA_TEST_LIVE") != "1":
+        pytest.skip("set HA_TEST_LIVE=1 to run tests against a live Home Assistant")
+    url, token = os.environ.get("HA_URL"), os.environ.get("HA_TOKEN")
+    if not url or not token:
+        pytest.skip("HA_URL and HA_TOKEN are required for live tests")
+    async with HomeAssistantSkill(base_url=url, token=token) as skill:
+        yield skill
+
+
+@pytest.fixture
+def cached_request(live_skill):
+    """Serve ``live_skill._request`` GETs from an on-disk cache under tests/fixtures/cache.
+
+    A miss goes to the live instance and records the response; delete the
+    directory to re-record. Entries are keyed by base URL as well, so another
+    instance never replays this one's data. Writes (POST) and the /api/ liveness
+    ping always hit the server.
+    """
+    real_request = live_skill._request
+    base_url = live_skill.base_url
+
+    async def request(method, path, json=None):
+        if method != "GET" or path == "":
+            return await real_request(method, path, json=json)
+        key = orjson.dumps([base_url, method, path, json], option=orjson.OPT_SORT_KEYS)
+        cache_file = RESPONSE_CACHE_DIR / f"{hashlib.sha256(key).hexdigest()}.json"
+        if cache_file.exists():
+            return orjson.loads(cache_file.read_bytes())
+        result = await real_request(method, path, json=json)
+        RESPONSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(orjson.dumps(result))
+        return result
+
+    live_skill._request = request
+    yield live_skill
+    del live_skill._request
@@ -0,0 +1,30 @@
+"""Read-only tests against a live Home Assistant (HA_TEST_LIVE=1, HA_URL, HA_TOKEN)."""
+
+from openclaw_python_skill import SkillInput
+
+
+async def test_live_get_config(cached_request):
+    output = await cached_request.execute(SkillInput(action="get_config", parameters={}))
+
+    assert output.success is True
+    assert output.result["version"]
+
+
+async def test_live_device_summary_matches_states(cached_request):
+    states = await cached_request.execute(SkillInput(action="get_states", parameters={}))
+    summary = await cached_request.execute(SkillInput(action="device_summary", parameters={}))
+
+    assert states.success is True
+    assert summary.success is True
+    assert summary.result["total_entities"] == states.result["count"]
+
+
+async def test_live_health_check(live_skill):
+    """Bypasses the replay cache: a recorded response can't prove the instance is up."""
+    live_skill.clear_caches()
+    output = await live_skill.execute(
+        SkillInput(action="health_check", parameters={"verify_api": True})
+    )
+
+    assert output.success is True
+    assert output.result["reachable"] is True
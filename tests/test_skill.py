@@ -1,101 +1,176 @@
 """Tests for HomeAssistantSkill."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock
+from urllib.parse import parse_qs, urlsplit
 
 import httpx
+import orjson
 import pytest
+import pytest_asyncio
+import respx
 from openclaw_python_skill import SkillInput
 
 from openclaw_homeassistant import HomeAssistantSkill
 
 BASE_URL = "http://homeassistant.local:8123"
 TOKEN = "test-token-abc123"
+EXPECTED_HEADERS = {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
+HISTORY_PATH_PREFIX = "history/period"
+
+# SkillInputs are built once per distinct (action, parameters) and shared between
+# tests; execute() only reads them
+_INPUTS: dict[bytes, SkillInput] = {}
+
+
+def make_input(action, **parameters):
+    """Return the cached SkillInput for ``action`` with ``parameters``."""
+    key = orjson.dumps([action, parameters], option=orjson.OPT_SORT_KEYS)
+    if key not in _INPUTS:
+        _INPUTS[key] = SkillInput(action=action, parameters=parameters)
+    return _INPUTS[key]
+
+
+GET_STATES_INPUT = make_input("get_states")
+GET_CONFIG_INPUT = make_input("get_config")
+GET_LOGBOOK_INPUT = make_input("get_logbook")
+GET_AUTOMATIONS_INPUT = make_input("get_automations")
+DEVICE_SUMMARY_INPUT = make_input("device_summary")
+HEALTH_CHECK_INPUT = make_input("health_check")
+
+
+@pytest_asyncio.fixture(scope="module")
+async def skill(shared_client):
+    async with HomeAssistantSkill(base_url=BASE_URL, token=TOKEN, client=shared_client) as skill:
+        yield skill
+
+
+@pytest.fixture(autouse=True)
+def _clear_skill_caches(skill):
+    """The skill is shared by the whole module, so drop its caches after each test."""
+    yield
+    skill.clear_caches()
 
 
 @pytest.fixture
-def skill():
-    return HomeAssistantSkill(base_url=BASE_URL, token=TOKEN)
+def mock_request(skill):
+    """Shadow ``skill._request`` with an AsyncMock the test configures.
 
+    Deleting the instance attribute afterwards exposes the real method again.
+    """
+    skill._request = mock = AsyncMock()
+    yield mock
+    del skill._request
 
-# --- get_states ---
 
+@pytest.fixture
+def mock_request_text(skill):
+    """Shadow ``skill._request_text`` with an AsyncMock the test configures."""
+    skill._request_text = mock = AsyncMock()
+    yield mock
+    del skill._request_text
 
-@pytest.mark.asyncio
-async def test_get_states(skill):
-    mock_response = [
-        {
-            "entity_id": "light.living_room",
-            "state": "on",
-            "attributes": {"brightness": 255},
-            "last_changed": "2024-01-01T12:00:00+00:00",
-        },
-        {
-            "entity_id": "sensor.temperature",
-            "state": "21.5",
-            "attributes": {"unit_of_measurement": "°C"},
-            "last_changed": "2024-01-01T12:05:00+00:00",
-        },
-    ]
 
-    with patch.object(skill, "_request", return_value=mock_response):
-        input_data = SkillInput(action="get_states", parameters={})
-        output = await skill.execute(input_data)
+@pytest.fixture(scope="module")
+def api_router():
+    """A respx router with every endpoint the request tests hit, built once per module."""
+    with respx.mock(base_url=f"{BASE_URL}/api", assert_all_called=False) as router:
+        router.get("/", name="api").respond(200, json={"message": "API running."})
+        router.get("/states", name="states").respond(200, json=[])
+        router.get(path__regex=r"/states/.+", name="state").respond(200, json={})
+        router.get("/config", name="config").respond(200, json={})
+        router.post("/template", name="template").respond(200, text="")
+        yield router
 
-    assert output.success is True
-    assert output.result["count"] == 2
-    assert output.result["states"][0]["entity_id"] == "light.living_room"
-    assert output.result["states"][0]["state"] == "on"
-    assert output.result["states"][1]["entity_id"] == "sensor.temperature"
 
+@pytest.fixture
+def api(api_router):
+    """The module router; responses a test sets and calls it records are rolled back after."""
+    api_router.snapshot()
+    yield api_router
+    api_router.rollback()
 
-@pytest.mark.asyncio
-async def test_get_states_empty(skill):
-    with patch.object(skill, "_request", return_value=[]):
-        input_data = SkillInput(action="get_states", parameters={})
-        output = await skill.execute(input_data)
 
-    assert output.success is True
-    assert output.result["count"] == 0
-    assert output.result["states"] == []
+def assert_query(call_path, path, **params):
+    """Assert ``call_path`` is ``path`` with exactly the query parameters ``params``."""
+    url = urlsplit(call_path)
+    assert url.path == path
+    assert parse_qs(url.query, keep_blank_values=True) == {k: [v] for k, v in params.items()}
 
 
-# --- get_state ---
+def assert_called_once_with(mock, *args, **kwargs):
+    """Compare ``call_args`` directly; pytest's assert rewriting still shows the diff."""
+    assert mock.call_count == 1
+    assert mock.call_args.args == args
+    assert mock.call_args.kwargs == kwargs
+
+
+# --- get_states ---
 
 
-@pytest.mark.asyncio
-async def test_get_state(skill):
-    mock_response = {
+STATES_RESPONSE = [
+    {
         "entity_id": "light.living_room",
         "state": "on",
-        "attributes": {"brightness": 200, "friendly_name": "Living Room"},
+        "attributes": {"brightness": 255},
         "last_changed": "2024-01-01T12:00:00+00:00",
-    }
+    },
+    {
+        "entity_id": "sensor.temperature",
+        "state": "21.5",
+        "attributes": {"unit_of_measurement": "°C"},
+        "last_changed": "2024-01-01T12:05:00+00:00",
+    },
+]
+
 
-    with patch.object(skill, "_request", return_value=mock_response) as mock_req:
-        input_data = SkillInput(action="get_state", parameters={"entity_id": "light.living_room"})
-        output = await skill.execute(input_data)
+@pytest.mark.parametrize("states", [STATES_RESPONSE, []], ids=["populated", "empty"])
+async def test_get_states(skill, mock_request, states):
+    mock_request.return_value = states
+    output = await skill.execute(GET_STATES_INPUT)
 
     assert output.success is True
-    assert output.result["entity_id"] == "light.living_room"
-    assert output.result["state"] == "on"
-    assert output.result["attributes"]["brightness"] == 200
-    mock_req.assert_called_once_with("GET", "states/light.living_room")
+    assert output.result["count"] == len(states)
+    assert output.result["states"] == states
+
+
+async def test_missing_attributes_default_is_not_shared(skill, mock_request):
+    mock_request.return_value = [{"entity_id": "light.x", "state": "on"}]
+    output = await skill.execute(GET_STATES_INPUT)
+    output.result["states"][0]["attributes"]["poison"] = 1
 
+    mock_request.return_value = {"entity_id": "light.y", "state": "off"}
+    output = await skill.execute(make_input("get_state", entity_id="light.y"))
 
-@pytest.mark.asyncio
-async def test_get_state_missing_entity_id(skill):
-    input_data = SkillInput(action="get_state", parameters={})
+    assert output.result["attributes"] == {}
+
+
+# --- get_state ---
+
+
+STATE_RESPONSE = {
+    "entity_id": "light.living_room",
+    "state": "on",
+    "attributes": {"brightness": 200, "friendly_name": "Living Room"},
+    "last_changed": "2024-01-01T12:00:00+00:00",
+}
+
+
+async def test_get_state(skill, mock_request):
+    mock_request.return_value = STATE_RESPONSE
+    input_data = make_input("get_state", entity_id="light.living_room")
     output = await skill.execute(input_data)
 
-    assert output.success is False
-    assert "entity_id" in output.error.lower()
+    assert output.success is True
+    assert output.result["entity_id"] == "light.living_room"
+    assert output.result["state"] == "on"
+    assert output.result["attributes"]["brightness"] == 200
+    assert_called_once_with(mock_request, "GET", "states/light.living_room")
 
 
-@pytest.mark.asyncio
-async def test_get_state_not_found(skill):
-    with patch.object(skill, "_request", side_effect=ValueError("Not found: states/fake.entity")):
-        input_data = SkillInput(action="get_state", parameters={"entity_id": "fake.entity"})
-        output = await skill.execute(input_data)
+async def test_get_state_not_found(skill, mock_request):
+    mock_request.side_effect = ValueError("Not found: states/fake.entity")
+    input_data = make_input("get_state", entity_id="fake.entity")
+    output = await skill.execute(input_data)
 
     assert output.success is False
     assert "not found" in output.error.lower()
@@ -104,163 +179,158 @@ async def test_get_state_not_found(skill):
 # --- call_service ---
 
 
-@pytest.mark.asyncio
-async def test_call_service_light_on(skill):
-    mock_response = [
-        {
-            "entity_id": "light.living_room",
-            "state": "on",
-            "attributes": {"brightness": 255},
-        }
-    ]
+SERVICE_RESPONSE = [{"entity_id": "light.living_room", "state": "on"}]
 
-    with patch.object(skill, "_request", return_value=mock_response) as mock_req:
-        input_data = SkillInput(
-            action="call_service",
-            parameters={
-                "domain": "light",
-                "service": "turn_on",
-                "entity_id": "light.living_room",
-            },
-        )
-        output = await skill.execute(input_data)
 
-    assert output.success is True
-    assert output.result["domain"] == "light"
-    assert output.result["service"] == "turn_on"
-    assert len(output.result["result"]) == 1
-    mock_req.assert_called_once_with(
-        "POST",
-        "services/light/turn_on",
-        json={"entity_id": "light.living_room"},
-    )
-
-
-@pytest.mark.asyncio
-async def test_call_service_with_data(skill):
-    with patch.object(skill, "_request", return_value=[]) as mock_req:
-        input_data = SkillInput(
-            action="call_service",
-            parameters={
+@pytest.mark.parametrize(
+    ("parameters", "expected_json"),
+    [
+        (
+            {"domain": "light", "service": "turn_on", "entity_id": "light.living_room"},
+            {"entity_id": "light.living_room"},
+        ),
+        (
+            {
                 "domain": "light",
                 "service": "turn_on",
                 "entity_id": "light.bedroom",
                 "data": {"brightness": 128, "color_name": "blue"},
             },
-        )
-        output = await skill.execute(input_data)
+            {"entity_id": "light.bedroom", "brightness": 128, "color_name": "blue"},
+        ),
+        (
+            {"domain": "light", "service": "turn_off", "entity_id": ["light.a", "light.b"]},
+            {"entity_id": ["light.a", "light.b"]},
+        ),
+        ({"domain": "homeassistant", "service": "restart"}, {}),
+    ],
+    ids=["entity", "entity_with_data", "entity_list", "no_target"],
+)
+async def test_call_service(skill, mock_request, parameters, expected_json):
+    mock_request.return_value = SERVICE_RESPONSE
+    input_data = make_input("call_service", **parameters)
+    output = await skill.execute(input_data)
 
     assert output.success is True
-    mock_req.assert_called_once_with(
+    assert output.result["domain"] == parameters["domain"]
+    assert output.result["service"] == parameters["service"]
+    assert len(output.result["result"]) == 1
+    assert_called_once_with(
+        mock_request,
         "POST",
-        "services/light/turn_on",
-        json={
-            "entity_id": "light.bedroom",
-            "brightness": 128,
-            "color_name": "blue",
-        },
+        f"services/{parameters['domain']}/{parameters['service']}",
+        json=expected_json,
     )
 
 
-@pytest.mark.asyncio
-async def test_call_service_missing_domain(skill):
-    input_data = SkillInput(action="call_service", parameters={"service": "turn_on"})
+async def test_call_service_invalid_data(skill):
+    input_data = make_input("call_service", domain="light", service="turn_on", data="bright")
     output = await skill.execute(input_data)
 
     assert output.success is False
-    assert "domain" in output.error.lower()
-
-
-@pytest.mark.asyncio
-async def test_call_service_missing_service(skill):
-    input_data = SkillInput(action="call_service", parameters={"domain": "light"})
-    output = await skill.execute(input_data)
-
-    assert output.success is False
-    assert "service" in output.error.lower()
+    assert "invalid parameter data" in output.error.lower()
 
 
 # --- get_history ---
 
 
-@pytest.mark.asyncio
-async def test_get_history(skill):
-    mock_response = [
-        [
-            {
-                "state": "on",
-                "last_changed": "2024-01-01T10:00:00+00:00",
-                "attributes": {},
-            },
-            {
-                "state": "off",
-                "last_changed": "2024-01-01T11:00:00+00:00",
-                "attributes": {},
-            },
-        ]
+HISTORY_RESPONSE = [
+    [
+        {"state": "on", "last_changed": "2024-01-01T10:00:00+00:00", "attributes": {}},
+        {"state": "off", "last_changed": "2024-01-01T11:00:00+00:00", "attributes": {}},
     ]
+]
 
-    with patch.object(skill, "_request", return_value=mock_response) as mock_req:
-        input_data = SkillInput(action="get_history", parameters={"entity_id": "light.living_room"})
-        output = await skill.execute(input_data)
+
+async def test_get_history(skill, mock_request):
+    mock_request.return_value = HISTORY_RESPONSE
+    input_data = make_input("get_history", entity_id="light.living_room")
+    output = await skill.execute(input_data)
 
     assert output.success is True
     assert output.result["entity_id"] == "light.living_room"
     assert output.result["count"] == 2
     assert output.result["history"][0]["state"] == "on"
     assert output.result["history"][1]["state"] == "off"
-    mock_req.assert_called_once()
-    call_path = mock_req.call_args[0][1]
-    assert "filter_entity_id=light.living_room" in call_path
+    mock_request.assert_called_once()
+    assert_query(
+        mock_request.call_args[0][1], HISTORY_PATH_PREFIX, filter_entity_id="light.living_room"
+    )
 
 
-@pytest.mark.asyncio
-async def test_get_history_with_time_range(skill):
-    with patch.object(skill, "_request", return_value=[[]]) as mock_req:
-        input_data = SkillInput(
-            action="get_history",
-            parameters={
-                "entity_id": "sensor.temp",
-                "start": "2024-01-01T00:00:00",
-                "end": "2024-01-02T00:00:00",
-            },
-        )
-        output = await skill.execute(input_data)
+async def test_get_history_with_time_range(skill, mock_request):
+    mock_request.return_value = [[]]
+    input_data = make_input(
+        "get_history",
+        entity_id="sensor.temp",
+        start="2024-01-01T00:00:00",
+        end="2024-01-02T00:00:00",
+    )
+    output = await skill.execute(input_data)
 
     assert output.success is True
-    call_path = mock_req.call_args[0][1]
-    assert "2024-01-01T00:00:00" in call_path
-    assert "end_time=2024-01-02T00:00:00" in call_path
+    assert_query(
+        mock_request.call_args[0][1],
+        f"{HISTORY_PATH_PREFIX}/2024-01-01T00:00:00",
+        filter_entity_id="sensor.temp",
+        end_time="2024-01-02T00:00:00",
+    )
 
 
-@pytest.mark.asyncio
-async def test_get_history_missing_entity_id(skill):
-    input_data = SkillInput(action="get_history", parameters={})
+async def test_get_history_encodes_query(skill, mock_request):
+    mock_request.return_value = [[]]
+    input_data = make_input(
+        "get_history",
+        entity_id="sensor.temp",
+        start="2024-01-01T00:00:00+01:00",
+        end="2024-01-02T00:00:00+01:00",
+    )
+    await skill.execute(input_data)
+
+    call_path = mock_request.call_args[0][1]
+    assert call_path == (
+        f"{HISTORY_PATH_PREFIX}/2024-01-01T00:00:00%2B01:00"
+        "?filter_entity_id=sensor.temp&end_time=2024-01-02T00:00:00%2B01:00"
+    )
+
+
+async def test_get_history_response_flags(skill, mock_request):
+    mock_request.return_value = []
+    input_data = make_input(
+        "get_history",
+        entity_id="sensor.temp",
+        minimal_response=True,
+        no_attributes=True,
+        skip_initial_state=False,
+    )
     output = await skill.execute(input_data)
 
-    assert output.success is False
-    assert "entity_id" in output.error.lower()
+    assert output.success is True
+    assert output.result["count"] == 0
+    call_path = mock_request.call_args[0][1]
+    assert call_path == (
+        f"{HISTORY_PATH_PREFIX}?filter_entity_id=sensor.temp&minimal_response=&no_attributes="
+    )
 
 
 # --- get_config ---
 
 
-@pytest.mark.asyncio
-async def test_get_config(skill):
-    mock_response = {
-        "location_name": "Home",
-        "latitude": 52.52,
-        "longitude": 13.405,
-        "elevation": 34,
-        "unit_system": {"temperature": "°C", "length": "km"},
-        "time_zone": "Europe/Berlin",
-        "version": "2024.1.0",
-        "components": ["light", "sensor", "automation"],
-    }
+CONFIG_RESPONSE = {
+    "location_name": "Home",
+    "latitude": 52.52,
+    "longitude": 13.405,
+    "elevation": 34,
+    "unit_system": {"temperature": "°C", "length": "km"},
+    "time_zone": "Europe/Berlin",
+    "version": "2024.1.0",
+    "components": ["light", "sensor", "automation"],
+}
+
 
-    with patch.object(skill, "_request", return_value=mock_response):
-        input_data = SkillInput(action="get_config", parameters={})
-        output = await skill.execute(input_data)
+async def test_get_config(skill, mock_request):
+    mock_request.return_value = CONFIG_RESPONSE
+    output = await skill.execute(GET_CONFIG_INPUT)
 
     assert output.success is True
     assert output.result["location_name"] == "Home"
@@ -269,98 +339,171 @@ async def test_get_config(skill):
     assert "light" in output.result["components"]
 
 
+async def test_get_config_cached(skill, mock_request):
+    mock_request.return_value = CONFIG_RESPONSE
+    await skill.execute(GET_CONFIG_INPUT)
+    output = await skill.execute(GET_CONFIG_INPUT)
+
+    assert output.success is True
+    assert output.result["version"] == "2024.1.0"
+    assert_called_once_with(mock_request, "GET", "config")
+
+
+async def test_get_config_cached_result_is_a_copy(skill, mock_request):
+    mock_request.return_value = {"unit_system": {"length": "km"}, "components": ["light"]}
+    output = await skill.execute(GET_CONFIG_INPUT)
+    output.result["unit_system"]["length"] = "mi"
+    output.result["components"].append("sensor")
+
+    output = await skill.execute(GET_CONFIG_INPUT)
+
+    assert output.result["unit_system"] == {"length": "km"}
+    assert output.result["components"] == ["light"]
+    assert mock_request.call_count == 1
+
+
+async def test_get_config_refresh(skill, mock_request):
+    mock_request.return_value = CONFIG_RESPONSE
+    await skill.execute(GET_CONFIG_INPUT)
+    await skill.execute(make_input("get_config", refresh=True))
+
+    assert mock_request.call_count == 2
+
+
 # --- Error handling ---
 
 
-@pytest.mark.asyncio
 async def test_unknown_action(skill):
-    input_data = SkillInput(action="invalid", parameters={})
+    input_data = make_input("invalid")
     output = await skill.execute(input_data)
 
     assert output.success is False
     assert "Unknown action" in output.error
 
 
-@pytest.mark.asyncio
-async def test_auth_error(skill):
-    with patch.object(
-        skill, "_request", side_effect=ValueError("Authentication failed: invalid or expired token")
-    ):
-        input_data = SkillInput(action="get_states", parameters={})
-        output = await skill.execute(input_data)
+@pytest.mark.parametrize(
+    ("action", "parameters", "missing"),
+    [
+        ("get_state", {}, "entity_id"),
+        ("get_state", {"entity_id": None}, "entity_id"),
+        ("call_service", {"service": "turn_on"}, "domain"),
+        ("call_service", {"domain": "light"}, "service"),
+        ("get_history", {}, "entity_id"),
+        ("get_entities_by_domain", {}, "domain"),
+        ("get_states_batch", {"entity_ids": []}, "entity_ids"),
+        ("fire_event", {}, "event_type"),
+        ("render_template", {}, "template"),
+        ("get_automations", {"service": "trigger"}, "entity_id"),
+    ],
+)
+async def test_missing_required_parameter(skill, action, parameters, missing):
+    input_data = make_input(action, **parameters)
+    output = await skill.execute(input_data)
 
     assert output.success is False
-    assert "authentication" in output.error.lower()
+    assert output.error == f"Missing required parameter: {missing}"
 
 
-@pytest.mark.asyncio
-async def test_network_error(skill):
-    with patch.object(skill, "_request", side_effect=httpx.ConnectError("Connection refused")):
-        input_data = SkillInput(action="get_states", parameters={})
-        output = await skill.execute(input_data)
+@pytest.mark.parametrize(
+    ("action", "parameters", "expected_call"),
+    [
+        (
+            "get_history",
+            {
+                "entity_id": "sensor.temp",
+                "start": None,
+                "end": None,
+                "minimal_response": None,
+                "no_attributes": None,
+                "skip_initial_state": None,
+            },
+            ("GET", f"{HISTORY_PATH_PREFIX}?filter_entity_id=sensor.temp"),
+        ),
+        ("get_logbook", {"entity": None, "start": None, "end": None}, ("GET", "logbook")),
+        ("get_config", {"refresh": None}, ("GET", "config")),
+        ("health_check", {"verify_api": None}, ("GET", "config")),
+        (
+            "call_service",
+            {"domain": "light", "service": "turn_on", "entity_id": None, "data": None},
+            ("POST", "services/light/turn_on"),
+        ),
+    ],
+    ids=["get_history", "get_logbook", "get_config", "health_check", "call_service"],
+)
+async def test_none_parameter_uses_default(skill, mock_request, action, parameters, expected_call):
+    """Agents often send null for optional arguments; treat it as not given."""
+    mock_request.return_value = {}
+    output = await skill.execute(make_input(action, **parameters))
+
+    assert output.success is True
+    assert mock_request.call_count == 1
+    assert mock_request.call_args.args == expected_call
+
+
+async def test_auth_error(skill, mock_request):
+    mock_request.side_effect = ValueError("Authentication failed: invalid or expired token")
+    output = await skill.execute(GET_STATES_INPUT)
 
     assert output.success is False
-    assert output.error is not None
+    assert "authentication" in output.error.lower()
 
 
-# --- _request integration ---
+async def test_network_error(skill, mock_request):
+    mock_request.side_effect = httpx.ConnectError("Connection refused")
+    output = await skill.execute(GET_STATES_INPUT)
 
+    assert output.success is False
+    assert output.error is not None
 
-def test_request_builds_correct_url(skill):
-    """Verify that _request builds the correct URL with auth headers."""
-    import unittest.mock as mock
 
-    mock_response = mock.MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"key": "value"}
+# --- _request integration ---
 
-    mock_client = mock.MagicMock()
-    mock_client.__enter__ = mock.MagicMock(return_value=mock_client)
-    mock_client.__exit__ = mock.MagicMock(return_value=False)
-    mock_client.request.return_value = mock_response
 
-    with mock.patch("httpx.Client", return_value=mock_client) as mock_cls:
-        result = skill._request("GET", "states")
+async def test_request_builds_correct_url(skill, api):
+    """Verify that _request uses the shared client with base URL and auth headers."""
+    api["states"].respond(200, json={"key": "value"})
 
-    assert result == {"key": "value"}
-    mock_cls.assert_called_once()
-    call_kwargs = mock_cls.call_args[1]
-    assert call_kwargs["headers"]["Authorization"] == f"Bearer {TOKEN}"
-    mock_client.request.assert_called_once_with("GET", f"{BASE_URL}/api/states", json=None)
+    assert await skill._request("GET", "states") == {"key": "value"}
+    assert api["states"].called
+    request = api["states"].calls.last.request
+    assert {name: request.headers[name] for name in EXPECTED_HEADERS} == EXPECTED_HEADERS
+    assert request.content == b""
 
 
-def test_request_raises_on_401(skill):
-    import unittest.mock as mock
+async def test_request_reuses_client(skill, api):
+    await skill._request("GET", "states")
+    await skill._request("GET", "config")
 
-    mock_response = mock.MagicMock()
-    mock_response.status_code = 401
-    mock_response.text = "Unauthorized"
+    assert api["states"].call_count == 1
+    assert api["config"].call_count == 1
 
-    mock_client = mock.MagicMock()
-    mock_client.__enter__ = mock.MagicMock(return_value=mock_client)
-    mock_client.__exit__ = mock.MagicMock(return_value=False)
-    mock_client.request.return_value = mock_response
 
-    with mock.patch("httpx.Client", return_value=mock_client):
-        with pytest.raises(ValueError, match="Authentication failed"):
-            skill._request("GET", "states")
+@pytest.mark.parametrize(
+    ("route", "path", "status", "body", "match"),
+    [
+        ("states", "states", 401, "Unauthorized", "Authentication failed"),
+        ("state", "states/fake.entity", 404, "Not found", "Not found: states/fake.entity"),
+        ("states", "states", 500, '{"message": "boom"}', 'HTTP 500: {"message": "boom"}'),
+    ],
+)
+async def test_request_raises_on_error_status(skill, api, route, path, status, body, match):
+    api[route].respond(status, text=body)
 
+    with pytest.raises(ValueError, match=match):
+        await skill._request("GET", path)
 
-def test_request_raises_on_404(skill):
-    import unittest.mock as mock
 
-    mock_response = mock.MagicMock()
-    mock_response.status_code = 404
-    mock_response.text = "Not found"
+async def test_aclose_closes_client():
+    s = HomeAssistantSkill(base_url=BASE_URL, token=TOKEN)
+    await s.aclose()
+    assert s._client.is_closed
 
-    mock_client = mock.MagicMock()
-    mock_client.__enter__ = mock.MagicMock(return_value=mock_client)
-    mock_client.__exit__ = mock.MagicMock(return_value=False)
-    mock_client.request.return_value = mock_response
 
-    with mock.patch("httpx.Client", return_value=mock_client):
-        with pytest.raises(ValueError, match="Not found"):
-            skill._request("GET", "states/fake.entity")
+async def test_aclose_leaves_injected_client_open():
+    async with httpx.AsyncClient() as client:
+        s = HomeAssistantSkill(base_url=BASE_URL, token=TOKEN, client=client)
+        await s.aclose()
+        assert not client.is_closed
 
 
 # --- describe ---
@@ -390,11 +533,10 @@ MIXED_STATES = [
 ]
 
 
-@pytest.mark.asyncio
-async def test_get_entities_by_domain(skill):
-    with patch.object(skill, "_request", return_value=MIXED_STATES):
-        input_data = SkillInput(action="get_entities_by_domain", parameters={"domain": "light"})
-        output = await skill.execute(input_data)
+async def test_get_entities_by_domain(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    input_data = make_input("get_entities_by_domain", domain="light")
+    output = await skill.execute(input_data)
 
     assert output.success is True
     assert output.result["domain"] == "light"
@@ -404,247 +546,245 @@ async def test_get_entities_by_domain(skill):
     assert "light.bedroom" in ids
 
 
-@pytest.mark.asyncio
-async def test_get_entities_by_domain_empty(skill):
-    with patch.object(skill, "_request", return_value=MIXED_STATES):
-        input_data = SkillInput(action="get_entities_by_domain", parameters={"domain": "climate"})
-        output = await skill.execute(input_data)
+async def test_get_entities_by_domain_empty(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    input_data = make_input("get_entities_by_domain", domain="climate")
+    output = await skill.execute(input_data)
 
     assert output.success is True
     assert output.result["count"] == 0
 
 
-@pytest.mark.asyncio
-async def test_get_entities_by_domain_missing_domain(skill):
-    input_data = SkillInput(action="get_entities_by_domain", parameters={})
+async def test_get_entities_by_domain_no_partial_match(skill, mock_request):
+    """Ensure 'light_strip.hall' does NOT match domain 'light'."""
+    mock_request.return_value = MIXED_STATES
+    input_data = make_input("get_entities_by_domain", domain="light")
     output = await skill.execute(input_data)
 
-    assert output.success is False
-    assert "domain" in output.error.lower()
+    ids = [s["entity_id"] for s in output.result["states"]]
+    assert "light_strip.hall" not in ids
 
 
-@pytest.mark.asyncio
-async def test_get_entities_by_domain_no_partial_match(skill):
-    """Ensure 'light_strip.hall' does NOT match domain 'light'."""
-    with patch.object(skill, "_request", return_value=MIXED_STATES):
-        input_data = SkillInput(action="get_entities_by_domain", parameters={"domain": "light"})
-        output = await skill.execute(input_data)
+# --- get_states_batch ---
+
+
+async def test_get_states_batch(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    input_data = make_input(
+        "get_states_batch", entity_ids=["sensor.temperature", "light.kitchen", "light.bedroom"]
+    )
+    output = await skill.execute(input_data)
 
+    assert output.success is True
     ids = [s["entity_id"] for s in output.result["states"]]
-    assert "light_strip.hall" not in ids
+    assert ids == ["sensor.temperature", "light.bedroom"]
+    assert output.result["states"][0]["state"] == "21.5"
+    assert output.result["missing"] == ["light.kitchen"]
+    assert_called_once_with(mock_request, "GET", "states")
 
 
 # --- fire_event ---
 
 
-@pytest.mark.asyncio
-async def test_fire_event(skill):
+async def test_fire_event(skill, mock_request):
     mock_response = {"message": "Event my_event fired."}
-    with patch.object(skill, "_request", return_value=mock_response) as mock_req:
-        input_data = SkillInput(
-            action="fire_event",
-            parameters={"event_type": "my_event", "event_data": {"key": "value"}},
-        )
-        output = await skill.execute(input_data)
+    mock_request.return_value = mock_response
+    input_data = make_input("fire_event", event_type="my_event", event_data={"key": "value"})
+    output = await skill.execute(input_data)
 
     assert output.success is True
     assert output.result["event_type"] == "my_event"
     assert "fired" in output.result["message"]
-    mock_req.assert_called_once_with("POST", "events/my_event", json={"key": "value"})
+    assert_called_once_with(mock_request, "POST", "events/my_event", json={"key": "value"})
 
 
-@pytest.mark.asyncio
-async def test_fire_event_without_data(skill):
+async def test_fire_event_without_data(skill, mock_request):
     mock_response = {"message": "Event test fired."}
-    with patch.object(skill, "_request", return_value=mock_response) as mock_req:
-        input_data = SkillInput(action="fire_event", parameters={"event_type": "test"})
-        output = await skill.execute(input_data)
+    mock_request.return_value = mock_response
+    input_data = make_input("fire_event", event_type="test")
+    output = await skill.execute(input_data)
 
     assert output.success is True
-    mock_req.assert_called_once_with("POST", "events/test", json=None)
+    assert_called_once_with(mock_request, "POST", "events/test", json=None)
 
 
-@pytest.mark.asyncio
-async def test_fire_event_missing_event_type(skill):
-    input_data = SkillInput(action="fire_event", parameters={})
+async def test_fire_event_api_error(skill, mock_request):
+    mock_request.side_effect = ValueError("HTTP 500: Internal")
+    input_data = make_input("fire_event", event_type="bad_event")
     output = await skill.execute(input_data)
 
     assert output.success is False
-    assert "event_type" in output.error.lower()
-
 
-@pytest.mark.asyncio
-async def test_fire_event_api_error(skill):
-    with patch.object(skill, "_request", side_effect=ValueError("HTTP 500: Internal")):
-        input_data = SkillInput(action="fire_event", parameters={"event_type": "bad_event"})
-        output = await skill.execute(input_data)
 
-    assert output.success is False
+# --- get_logbook ---
 
 
-# --- get_logbook ---
+LOGBOOK_RESPONSE = [
+    {
+        "when": "2024-01-01T10:00:00",
+        "name": "Light",
+        "message": "turned on",
+        "entity_id": "light.living_room",
+        "state": "on",
+    },
+]
 
 
-@pytest.mark.asyncio
-async def test_get_logbook(skill):
-    mock_response = [
-        {
-            "when": "2024-01-01T10:00:00",
-            "name": "Light",
-            "message": "turned on",
-            "entity_id": "light.living_room",
-            "state": "on",
-        },
-    ]
-    with patch.object(skill, "_request", return_value=mock_response):
-        input_data = SkillInput(action="get_logbook", parameters={})
-        output = await skill.execute(input_data)
+async def test_get_logbook(skill, mock_request):
+    mock_request.return_value = LOGBOOK_RESPONSE
+    output = await skill.execute(GET_LOGBOOK_INPUT)
 
     assert output.success is True
     assert output.result["count"] == 1
     assert output.result["entries"][0]["name"] == "Light"
 
 
-@pytest.mark.asyncio
-async def test_get_logbook_with_entity(skill):
-    with patch.object(skill, "_request", return_value=[]) as mock_req:
-        input_data = SkillInput(action="get_logbook", parameters={"entity": "light.living_room"})
-        output = await skill.execute(input_data)
-
-    assert output.success is True
-    call_path = mock_req.call_args[0][1]
-    assert "entity=light.living_room" in call_path
-
-
-@pytest.mark.asyncio
-async def test_get_logbook_with_time_range(skill):
-    with patch.object(skill, "_request", return_value=[]) as mock_req:
-        input_data = SkillInput(
-            action="get_logbook",
-            parameters={"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00"},
-        )
-        output = await skill.execute(input_data)
-
-    assert output.success is True
-    call_path = mock_req.call_args[0][1]
-    assert "logbook/2024-01-01T00:00:00" in call_path
-    assert "end_time=2024-01-02T00:00:00" in call_path
-
-
-@pytest.mark.asyncio
-async def test_get_logbook_empty(skill):
-    with patch.object(skill, "_request", return_value=[]):
-        input_data = SkillInput(action="get_logbook", parameters={})
-        output = await skill.execute(input_data)
+async def test_get_logbook_empty(skill, mock_request):
+    mock_request.return_value = []
+    output = await skill.execute(GET_LOGBOOK_INPUT)
 
     assert output.success is True
     assert output.result["count"] == 0
 
 
-@pytest.mark.asyncio
-async def test_get_logbook_with_all_params(skill):
-    with patch.object(skill, "_request", return_value=[]) as mock_req:
-        input_data = SkillInput(
-            action="get_logbook",
-            parameters={
+@pytest.mark.parametrize(
+    ("parameters", "path", "query"),
+    [
+        ({"entity": "light.living_room"}, "logbook", {"entity": "light.living_room"}),
+        (
+            {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00"},
+            "logbook/2024-01-01T00:00:00",
+            {"end_time": "2024-01-02T00:00:00"},
+        ),
+        (
+            {
                 "entity": "sensor.temp",
                 "start": "2024-01-01T00:00:00",
                 "end": "2024-01-02T00:00:00",
             },
-        )
-        await skill.execute(input_data)
+            "logbook/2024-01-01T00:00:00",
+            {"entity": "sensor.temp", "end_time": "2024-01-02T00:00:00"},
+        ),
+    ],
+    ids=["entity", "time_range", "all_params"],
+)
+async def test_get_logbook_query(skill, mock_request, parameters, path, query):
+    mock_request.return_value = []
+    input_data = make_input("get_logbook", **parameters)
+    output = await skill.execute(input_data)
+
+    assert output.success is True
+    assert_query(mock_request.call_args[0][1], path, **query)
 
-    call_path = mock_req.call_args[0][1]
-    assert "entity=sensor.temp" in call_path
-    assert "end_time=2024-01-02T00:00:00" in call_path
-    assert "logbook/2024-01-01T00:00:00" in call_path
+
+async def test_get_logbook_encodes_query(skill, mock_request):
+    mock_request.return_value = []
+    input_data = make_input("get_logbook", entity="sensor.a&b", end="2024-01-02T00:00:00+01:00")
+    await skill.execute(input_data)
+
+    call_path = mock_request.call_args[0][1]
+    assert call_path == "logbook?entity=sensor.a%26b&end_time=2024-01-02T00:00:00%2B01:00"
 
 
 # --- render_template ---
 
 
-@pytest.mark.asyncio
-async def test_render_template(skill):
-    with patch.object(skill, "_request_text", return_value="21.5") as mock_req:
-        input_data = SkillInput(
-            action="render_template",
-            parameters={"template": "{{ states('sensor.temp') }}"},
-        )
-        output = await skill.execute(input_data)
+async def test_render_template(skill, mock_request_text):
+    mock_request_text.return_value = "21.5"
+    input_data = make_input("render_template", template="{{ states('sensor.temp') }}")
+    output = await skill.execute(input_data)
 
     assert output.success is True
     assert output.result["result"] == "21.5"
     assert output.result["template"] == "{{ states('sensor.temp') }}"
-    mock_req.assert_called_once_with(
-        "POST", "template", json={"template": "{{ states('sensor.temp') }}"}
+    assert_called_once_with(
+        mock_request_text, "POST", "template", json={"template": "{{ states('sensor.temp') }}"}
     )
 
 
-@pytest.mark.asyncio
-async def test_render_template_missing_template(skill):
-    input_data = SkillInput(action="render_template", parameters={})
+async def test_render_template_empty_result(skill, mock_request_text):
+    mock_request_text.return_value = ""
+    input_data = make_input("render_template", template="{{ none }}")
     output = await skill.execute(input_data)
 
-    assert output.success is False
-    assert "template" in output.error.lower()
+    assert output.success is True
+    assert output.result["result"] == ""
 
 
-@pytest.mark.asyncio
-async def test_render_template_empty_result(skill):
-    with patch.object(skill, "_request_text", return_value=""):
-        input_data = SkillInput(action="render_template", parameters={"template": "{{ none }}"})
-        output = await skill.execute(input_data)
+async def test_render_template_cached(skill, mock_request_text):
+    input_data = make_input("render_template", template="{{ 1 + 1 }}")
+    mock_request_text.return_value = "2"
+    await skill.execute(input_data)
+    output = await skill.execute(input_data)
 
     assert output.success is True
-    assert output.result["result"] == ""
+    assert output.result["result"] == "2"
+    mock_request_text.assert_called_once()
 
 
-# --- _request_text ---
+async def test_render_template_no_cache(skill, mock_request_text):
+    mock_request_text.return_value = "2"
+    await skill.execute(make_input("render_template", template="{{ 1 + 1 }}"))
+    await skill.execute(make_input("render_template", template="{{ 1 + 1 }}", no_cache=True))
 
+    assert mock_request_text.call_count == 2
 
-def test_request_text_returns_text(skill):
-    import unittest.mock as mock
 
-    mock_response = mock.MagicMock()
-    mock_response.status_code = 200
-    mock_response.text = "rendered output"
+async def test_render_template_no_cache_leaves_cache_untouched(
+    skill, mock_request_text, monkeypatch
+):
+    monkeypatch.setattr(skill, "_TEMPLATE_CACHE_SIZE", 2)
+    mock_request_text.return_value = "x"
+    for template in ("{{ a }}", "{{ b }}"):
+        await skill.execute(make_input("render_template", template=template))
+    before = dict(skill._template_cache)
 
-    mock_client = mock.MagicMock()
-    mock_client.__enter__ = mock.MagicMock(return_value=mock_client)
-    mock_client.__exit__ = mock.MagicMock(return_value=False)
-    mock_client.request.return_value = mock_response
+    mock_request_text.return_value = "12:00"
+    output = await skill.execute(
+        make_input("render_template", template="{{ now() }}", no_cache=True)
+    )
 
-    with mock.patch("httpx.Client", return_value=mock_client):
-        result = skill._request_text("POST", "template", json={"template": "test"})
+    assert output.result["result"] == "12:00"
+    assert list(skill._template_cache) == ["{{ a }}", "{{ b }}"]
+    assert dict(skill._template_cache) == before
 
-    assert result == "rendered output"
+
+async def test_render_template_cache_evicts_oldest(skill, mock_request_text, monkeypatch):
+    monkeypatch.setattr(skill, "_TEMPLATE_CACHE_SIZE", 2)
+    mock_request_text.return_value = "x"
+    for template in ("{{ a }}", "{{ b }}", "{{ c }}"):
+        await skill.execute(make_input("render_template", template=template))
+
+    assert list(skill._template_cache) == ["{{ b }}", "{{ c }}"]
 
 
-def test_request_text_raises_on_401(skill):
-    import unittest.mock as mock
+# --- _request_text ---
+
 
-    mock_response = mock.MagicMock()
-    mock_response.status_code = 401
-    mock_response.text = "Unauthorized"
+async def test_request_text_returns_text(skill, api):
+    api["template"].respond(200, text="rendered output")
 
-    mock_client = mock.MagicMock()
-    mock_client.__enter__ = mock.MagicMock(return_value=mock_client)
-    mock_client.__exit__ = mock.MagicMock(return_value=False)
-    mock_client.request.return_value = mock_response
+    result = await skill._request_text("POST", "template", json={"template": "test"})
 
-    with mock.patch("httpx.Client", return_value=mock_client):
-        with pytest.raises(ValueError, match="Authentication failed"):
-            skill._request_text("POST", "template")
+    assert result == "rendered output"
+    request = api["template"].calls.last.request
+    assert request.content == b'{"template":"test"}'
+    assert {name: request.headers[name] for name in EXPECTED_HEADERS} == EXPECTED_HEADERS
+
+
+async def test_request_text_raises_on_401(skill, api):
+    api["template"].respond(401, text="Unauthorized")
+
+    with pytest.raises(ValueError, match="Authentication failed"):
+        await skill._request_text("POST", "template")
 
 
 # --- get_automations ---
 
 
-@pytest.mark.asyncio
-async def test_get_automations_list(skill):
-    with patch.object(skill, "_request", return_value=MIXED_STATES):
-        input_data = SkillInput(action="get_automations", parameters={})
-        output = await skill.execute(input_data)
+async def test_get_automations_list(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    output = await skill.execute(GET_AUTOMATIONS_INPUT)
 
     assert output.success is True
     assert output.result["count"] == 2
@@ -653,74 +793,46 @@ async def test_get_automations_list(skill):
     assert "automation.night" in ids
 
 
-@pytest.mark.asyncio
-async def test_get_automations_list_empty(skill):
+async def test_get_automations_list_empty(skill, mock_request):
     states = [{"entity_id": "light.x", "state": "on", "attributes": {}, "last_changed": ""}]
-    with patch.object(skill, "_request", return_value=states):
-        input_data = SkillInput(action="get_automations", parameters={})
-        output = await skill.execute(input_data)
+    mock_request.return_value = states
+    output = await skill.execute(GET_AUTOMATIONS_INPUT)
 
     assert output.success is True
     assert output.result["count"] == 0
 
 
-@pytest.mark.asyncio
-async def test_get_automations_trigger(skill):
-    with patch.object(skill, "_request", return_value=[]) as mock_req:
-        input_data = SkillInput(
-            action="get_automations",
-            parameters={"service": "trigger", "entity_id": "automation.morning"},
-        )
-        output = await skill.execute(input_data)
+@pytest.mark.parametrize("service", ["trigger", "turn_on", "turn_off"])
+async def test_get_automations_service(skill, mock_request, service):
+    mock_request.return_value = []
+    input_data = make_input("get_automations", service=service, entity_id="automation.morning")
+    output = await skill.execute(input_data)
 
     assert output.success is True
-    assert output.result["service"] == "trigger"
-    mock_req.assert_called_once_with(
-        "POST", "services/automation/trigger", json={"entity_id": "automation.morning"}
+    assert output.result["service"] == service
+    assert_called_once_with(
+        mock_request,
+        "POST",
+        f"services/automation/{service}",
+        json={"entity_id": "automation.morning"},
     )
 
 
-@pytest.mark.asyncio
-async def test_get_automations_turn_on(skill):
-    with patch.object(skill, "_request", return_value=[]):
-        input_data = SkillInput(
-            action="get_automations",
-            parameters={"service": "turn_on", "entity_id": "automation.night"},
-        )
-        output = await skill.execute(input_data)
-
-    assert output.success is True
-    assert output.result["service"] == "turn_on"
-
-
-@pytest.mark.asyncio
-async def test_get_automations_turn_off(skill):
-    with patch.object(skill, "_request", return_value=[]):
-        input_data = SkillInput(
-            action="get_automations",
-            parameters={"service": "turn_off", "entity_id": "automation.night"},
-        )
-        output = await skill.execute(input_data)
-
-    assert output.success is True
-    assert output.result["service"] == "turn_off"
-
-
-@pytest.mark.asyncio
-async def test_get_automations_service_missing_entity_id(skill):
-    input_data = SkillInput(action="get_automations", parameters={"service": "trigger"})
+async def test_get_automations_service_entity_list(skill, mock_request):
+    mock_request.return_value = []
+    entity_ids = ["automation.morning", "automation.night"]
+    input_data = make_input("get_automations", service="turn_off", entity_id=entity_ids)
     output = await skill.execute(input_data)
 
-    assert output.success is False
-    assert "entity_id" in output.error.lower()
+    assert output.success is True
+    assert output.result["entity_id"] == entity_ids
+    assert_called_once_with(
+        mock_request, "POST", "services/automation/turn_off", json={"entity_id": entity_ids}
+    )
 
 
-@pytest.mark.asyncio
 async def test_get_automations_invalid_service(skill):
-    input_data = SkillInput(
-        action="get_automations",
-        parameters={"service": "delete", "entity_id": "automation.x"},
-    )
+    input_data = make_input("get_automations", service="delete", entity_id="automation.x")
     output = await skill.execute(input_data)
 
     assert output.success is False
@@ -730,11 +842,9 @@ async def test_get_automations_invalid_service(skill):
 # --- device_summary ---
 
 
-@pytest.mark.asyncio
-async def test_device_summary(skill):
-    with patch.object(skill, "_request", return_value=MIXED_STATES):
-        input_data = SkillInput(action="device_summary", parameters={})
-        output = await skill.execute(input_data)
+async def test_device_summary(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    output = await skill.execute(DEVICE_SUMMARY_INPUT)
 
     assert output.success is True
     assert output.result["total_entities"] == 6
@@ -744,22 +854,18 @@ async def test_device_summary(skill):
     assert domains["light"]["states"]["off"] == 1
 
 
-@pytest.mark.asyncio
-async def test_device_summary_empty(skill):
-    with patch.object(skill, "_request", return_value=[]):
-        input_data = SkillInput(action="device_summary", parameters={})
-        output = await skill.execute(input_data)
+async def test_device_summary_empty(skill, mock_request):
+    mock_request.return_value = []
+    output = await skill.execute(DEVICE_SUMMARY_INPUT)
 
     assert output.success is True
     assert output.result["total_entities"] == 0
     assert output.result["total_domains"] == 0
 
 
-@pytest.mark.asyncio
-async def test_device_summary_multiple_domains(skill):
-    with patch.object(skill, "_request", return_value=MIXED_STATES):
-        input_data = SkillInput(action="device_summary", parameters={})
-        output = await skill.execute(input_data)
+async def test_device_summary_multiple_domains(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    output = await skill.execute(DEVICE_SUMMARY_INPUT)
 
     domain_names = [s["domain"] for s in output.result["summary"]]
     assert "light" in domain_names
@@ -768,50 +874,114 @@ async def test_device_summary_multiple_domains(skill):
     assert domain_names == sorted(domain_names)
 
 
+# --- states cache ---
+
+
+async def test_states_cache_shared_between_actions(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    await skill.execute(GET_STATES_INPUT)
+    await skill.execute(DEVICE_SUMMARY_INPUT)
+    output = await skill.execute(make_input("get_entities_by_domain", domain="light"))
+
+    assert output.success is True
+    assert output.result["count"] == 2
+    assert_called_once_with(mock_request, "GET", "states")
+
+
+async def test_states_cache_results_are_copies(skill, mock_request):
+    mock_request.return_value = [
+        {"entity_id": "light.x", "state": "on", "attributes": {"brightness": 1}}
+    ]
+    output = await skill.execute(GET_STATES_INPUT)
+    output.result["states"][0]["attributes"]["brightness"] = 255
+
+    output = await skill.execute(make_input("get_entities_by_domain", domain="light"))
+
+    assert output.result["states"][0]["attributes"] == {"brightness": 1}
+    assert mock_request.call_count == 1
+
+
+async def test_states_cache_expires(skill, mock_request, monkeypatch):
+    monkeypatch.setattr(skill, "states_ttl", 0)
+    mock_request.return_value = MIXED_STATES
+    await skill.execute(GET_STATES_INPUT)
+    await skill.execute(GET_STATES_INPUT)
+
+    assert mock_request.call_count == 2
+
+
+async def test_call_service_invalidates_states_cache(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    await skill.execute(GET_STATES_INPUT)
+    await skill.execute(
+        make_input("call_service", domain="light", service="turn_off", entity_id="light.x")
+    )
+    await skill.execute(GET_STATES_INPUT)
+
+    assert [c.args for c in mock_request.call_args_list] == [
+        ("GET", "states"),
+        ("POST", "services/light/turn_off"),
+        ("GET", "states"),
+    ]
+
+
+async def test_clear_caches(skill, mock_request):
+    mock_request.return_value = MIXED_STATES
+    await skill.execute(GET_STATES_INPUT)
+    skill.clear_caches()
+    await skill.execute(GET_STATES_INPUT)
+
+    assert mock_request.call_count == 2
+
+
 # --- health_check ---
 
 
-@pytest.mark.asyncio
-async def test_health_check(skill):
-    def mock_request(method, path, **kwargs):
-        if path == "":
-            return {"message": "API running."}
-        elif path == "config":
-            return {"version": "2024.1.0", "location_name": "Home"}
-        return {}
+API_RESPONSE = {"message": "API running."}
+
 
-    with patch.object(skill, "_request", side_effect=mock_request):
-        input_data = SkillInput(action="health_check", parameters={})
-        output = await skill.execute(input_data)
+async def test_health_check(skill, mock_request):
+    mock_request.return_value = CONFIG_RESPONSE
+    output = await skill.execute(HEALTH_CHECK_INPUT)
 
     assert output.success is True
     assert output.result["reachable"] is True
     assert output.result["version"] == "2024.1.0"
     assert output.result["message"] == "API running."
+    assert_called_once_with(mock_request, "GET", "config")
 
 
-@pytest.mark.asyncio
-async def test_health_check_api_down(skill):
-    with patch.object(skill, "_request", side_effect=httpx.ConnectError("Connection refused")):
-        input_data = SkillInput(action="health_check", parameters={})
-        output = await skill.execute(input_data)
+async def test_health_check_verify_api(skill, mock_request):
+    mock_request.side_effect = [API_RESPONSE, CONFIG_RESPONSE]
+    input_data = make_input("health_check", verify_api=True)
+    output = await skill.execute(input_data)
 
-    assert output.success is False
+    assert output.success is True
+    assert output.result["version"] == "2024.1.0"
+    assert output.result["message"] == "API running."
+    assert [c.args for c in mock_request.call_args_list] == [("GET", ""), ("GET", "config")]
 
 
-@pytest.mark.asyncio
-async def test_health_check_partial(skill):
-    call_count = 0
+async def test_health_check_cached_config_pings_api(skill, mock_request):
+    mock_request.side_effect = [CONFIG_RESPONSE, API_RESPONSE]
+    await skill.execute(GET_CONFIG_INPUT)
+    output = await skill.execute(HEALTH_CHECK_INPUT)
 
-    def mock_request(method, path, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            return {"message": "API running."}
-        raise ValueError("Config endpoint failed")
+    assert output.success is True
+    assert output.result["version"] == "2024.1.0"
+    assert [c.args for c in mock_request.call_args_list] == [("GET", "config"), ("GET", "")]
 
-    with patch.object(skill, "_request", side_effect=mock_request):
-        input_data = SkillInput(action="health_check", parameters={})
-        output = await skill.execute(input_data)
+
+async def test_health_check_api_down(skill, mock_request):
+    mock_request.side_effect = httpx.ConnectError("Connection refused")
+    output = await skill.execute(HEALTH_CHECK_INPUT)
+
+    assert output.success is False
+
+
+async def test_health_check_partial(skill, mock_request):
+    mock_request.side_effect = [API_RESPONSE, ValueError("Config endpoint failed")]
+    input_data = make_input("health_check", verify_api=True)
+    output = await skill.execute(input_data)
 
     assert output.success is False